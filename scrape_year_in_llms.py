@@ -16,15 +16,22 @@ Output:
 """
 
 import argparse
-import json
+import hashlib
 import re
 import sys
+import tempfile
+import threading
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
+from functools import lru_cache
 from pathlib import Path
-from urllib.parse import urljoin, urlparse
+from urllib.parse import urljoin, urlsplit
 
+import orjson
 import requests
-from bs4 import BeautifulSoup
+from requests.adapters import HTTPAdapter
+from bs4 import BeautifulSoup, Tag
 
 # Known URL patterns for Simon's year-in-review posts
 URL_PATTERNS = {
@@ -34,6 +41,72 @@ URL_PATTERNS = {
     # Future years - pattern: /YYYY/Dec/31/ with slug TBD
 }
 
+# Years scraped in parallel under --all
+MAX_YEAR_WORKERS = 8
+
+# Link verification limits
+MAX_VERIFY_LINKS = 50
+MAX_VERIFY_WORKERS = 20
+# Largest verification body read to completion so its connection is reused
+MAX_DRAIN_BYTES = 1024
+
+# Month references in section text, e.g. "March 5, 2025" or "June"
+_MONTH_RE = re.compile(
+    r'(January|February|March|April|May|June|July|August|September|October|November|December)'
+    r'\s*(\d{1,2})?,?\s*(\d{4})?',
+    re.IGNORECASE
+)
+
+# Hrefs that already carry a scheme (https:, mailto:, ...) need no joining
+_SCHEME_RE = re.compile(r'[a-z][a-z0-9+.-]*:', re.IGNORECASE)
+
+# Whole-word keywords used to categorize sections, in output order
+CATEGORY_KEYWORDS = {
+    # Model-related keywords
+    'models': frozenset({'gpt', 'chatgpt', 'claude', 'llama', 'gemini', 'mistral',
+                         'qwen', 'deepseek', 'model', 'parameter'}),
+    # Tools and products
+    'tools': frozenset({'tool', 'cli', 'api', 'code', 'app', 'plugin',
+                        'extension', 'library', 'sdk'}),
+    # Concepts and terminology
+    'concepts': frozenset({'concept', 'term', 'coined', 'definition',
+                           'paradigm', 'pattern', 'methodology'}),
+    # Pricing and business
+    'pricing': frozenset({'$', 'price', 'cost', 'subscription',
+                          'revenue', 'million', 'billion'}),
+    # Companies
+    'companies': frozenset({'openai', 'anthropic', 'google', 'meta',
+                            'microsoft', 'alibaba', 'amazon'}),
+    # Research
+    'research': frozenset({'research', 'paper', 'study', 'benchmark',
+                           'leaderboard', 'competition', 'olympiad'}),
+}
+
+# Words for keyword matching. Letters and digits are split so "qwen2.5" and
+# "gpt4o" still yield "qwen" and "gpt"; "$" is its own token for pricing.
+_WORD_RE = re.compile(r'[a-z]+|[0-9]+|\$')
+
+# Shared session so repeat hosts reuse pooled keep-alive connections
+SESSION = requests.Session()
+SESSION.headers['User-Agent'] = 'llm-timeline-visualization/1.0'
+# pool_connections is the number of per-host pools kept; size it so the
+# single verification batch (up to MAX_VERIFY_LINKS hosts for each known
+# year under --all) plus the blog itself fit without evicting live connections
+_adapter = HTTPAdapter(pool_connections=max(len(URL_PATTERNS), 1) * MAX_VERIFY_LINKS + 1,
+                       pool_maxsize=50)
+SESSION.mount('https://', _adapter)
+SESSION.mount('http://', _adapter)
+
+# Years are scraped concurrently; serialize their progress output
+_print_lock = threading.Lock()
+
+
+def log(message: str) -> None:
+    """Print a progress line without interleaving output between threads."""
+    with _print_lock:
+        print(message)
+
+
 # Predict URL for future years (may need adjustment)
 def get_url_for_year(year: int) -> str:
     if year in URL_PATTERNS:
@@ -47,26 +120,103 @@ def get_url_for_year(year: int) -> str:
     return possible_slugs[0]  # Return first guess, will need manual verification
 
 
-def fetch_page(url: str) -> str | None:
-    """Fetch page content with error handling."""
+def _cache_paths(cache_dir: Path, url: str) -> tuple[Path, Path]:
+    """Return the (body, metadata) cache file paths for a URL."""
+    key = hashlib.sha256(url.encode()).hexdigest()
+    return cache_dir / f"{key}.html", cache_dir / f"{key}.json"
+
+
+def _write_atomic(path: Path, data: bytes) -> None:
+    """Write a file via a temporary sibling so readers never see it partial."""
+    with tempfile.NamedTemporaryFile(dir=path.parent, prefix=path.name,
+                                     suffix='.tmp', delete=False) as tmp:
+        tmp.write(data)
     try:
-        response = requests.get(url, timeout=30)
+        Path(tmp.name).replace(path)
+    except OSError:
+        Path(tmp.name).unlink(missing_ok=True)
+        raise
+
+
+def fetch_page(url: str, cache_dir: Path | None = None) -> bytes | None:
+    """Fetch raw page bytes with error handling.
+
+    Bytes are returned undecoded: lxml parses them directly and detects the
+    charset itself, avoiding a full-page str copy.
+
+    With a cache_dir, the last response is stored on disk and revalidated
+    with a conditional GET (ETag / Last-Modified), so unchanged pages come
+    back as a 304 with no body transferred. An unreadable or corrupt cache
+    entry is treated as a miss.
+    """
+    headers = {}
+    cached_body = None
+    if cache_dir:
+        body_path, meta_path = _cache_paths(cache_dir, url)
+        try:
+            meta = orjson.loads(meta_path.read_bytes())
+            cached_body = body_path.read_bytes()
+        except (OSError, ValueError):
+            meta = None
+            cached_body = None
+        if isinstance(meta, dict):
+            if meta.get('etag'):
+                headers['If-None-Match'] = meta['etag']
+            if meta.get('last_modified'):
+                headers['If-Modified-Since'] = meta['last_modified']
+        else:
+            cached_body = None
+
+    try:
+        response = SESSION.get(url, timeout=30, headers=headers)
+        if cached_body is not None and response.status_code == 304:
+            log(f"  Not modified, using cached copy of {url}")
+            return cached_body
         response.raise_for_status()
-        return response.text
     except requests.RequestException as e:
-        print(f"Error fetching {url}: {e}")
+        log(f"Error fetching {url}: {e}")
         return None
 
-
-def extract_links(soup: BeautifulSoup, base_url: str) -> list[dict]:
-    """Extract all links from the article."""
+    if cache_dir:
+        # Drop the old metadata first and write it last, so an interrupted
+        # update can never pair a stale ETag with a different body
+        try:
+            cache_dir.mkdir(parents=True, exist_ok=True)
+            meta_path.unlink(missing_ok=True)
+            _write_atomic(body_path, response.content)
+            _write_atomic(meta_path, orjson.dumps({
+                'url': url,
+                'etag': response.headers.get('ETag'),
+                'last_modified': response.headers.get('Last-Modified')
+            }))
+        except OSError as e:
+            log(f"  Could not cache {url}: {e}")
+    return response.content
+
+
+def find_article(soup: BeautifulSoup) -> Tag:
+    """Locate the post body, falling back to the whole page."""
+    return soup.find('article') or soup.find('div', class_='entry-content') or soup
+
+
+@lru_cache(maxsize=None)
+def _url_origin(url: str) -> str:
+    """Return the scheme://host part of a URL, parsed once per page URL."""
+    parts = urlsplit(url)
+    return f"{parts.scheme}://{parts.netloc}"
+
+
+def extract_links(container: Tag, base_url: str) -> list[dict]:
+    """Extract all links inside a DOM node (the article or one paragraph)."""
     links = []
-    article = soup.find('article') or soup.find('div', class_='entry-content') or soup
-
-    for a in article.find_all('a', href=True):
+    for a in container.select('a[href]'):
         href = a['href']
-        # Make relative URLs absolute
-        if not href.startswith(('http://', 'https://')):
+        # Make relative URLs absolute; root-relative paths (the common case)
+        # only need the page origin prepended, not a full urljoin parse.
+        # Paths with dot segments ("/a/../b") still need urljoin to normalize.
+        if href[:1] == '/' and href[1:2] != '/' and '/.' not in href:
+            href = _url_origin(base_url) + href
+        elif not _SCHEME_RE.match(href):
             href = urljoin(base_url, href)
 
         text = a.get_text(strip=True)
@@ -79,95 +229,88 @@ def extract_links(soup: BeautifulSoup, base_url: str) -> list[dict]:
     return links
 
 
-def extract_headings_and_sections(soup: BeautifulSoup) -> list[dict]:
-    """Extract section headings and their content."""
+def extract_headings_and_sections(article: Tag, base_url: str) -> list[dict]:
+    """Extract section headings, their content and the links inside it."""
     sections = []
-    article = soup.find('article') or soup.find('div', class_='entry-content') or soup
-
-    for heading in article.find_all(['h2', 'h3']):
-        section = {
-            'title': heading.get_text(strip=True),
-            'level': int(heading.name[1]),
-            'content': []
-        }
-
-        # Get content until next heading
-        for sibling in heading.find_next_siblings():
-            if sibling.name in ['h2', 'h3']:
-                break
-            if sibling.name == 'p':
-                section['content'].append(sibling.get_text(strip=True))
+    # Latest heading seen under each parent element (keyed by id): a
+    # paragraph belongs to the nearest earlier heading among its siblings
+    open_sections = {}
+
+    # Single document-order pass: each heading opens a section and
+    # paragraphs sharing its parent (its siblings) are added to it. Text
+    # collapses whitespace rather than stripping each string, which would
+    # glue words to inline links ("releasedo1 modelscosting").
+    for node in article.find_all(['h2', 'h3', 'p']):
+        if node.name in ('h2', 'h3'):
+            section = {
+                'title': ' '.join(node.get_text().split()),
+                'level': int(node.name[1]),
+                'content': [],
+                # Links in the heading itself belong to its section too
+                'links': extract_links(node, base_url)
+            }
+            open_sections[id(node.parent)] = section
+            sections.append(section)
+            continue
 
-        sections.append(section)
+        section = open_sections.get(id(node.parent))
+        if section is not None:
+            section['content'].append(' '.join(node.get_text().split()))
+            section['links'].extend(extract_links(node, base_url))
 
     return sections
 
 
-def categorize_content(text: str) -> list[str]:
-    """Attempt to categorize content based on keywords."""
-    categories = []
-    text_lower = text.lower()
-
-    # Model-related keywords
-    if any(kw in text_lower for kw in ['gpt', 'claude', 'llama', 'gemini', 'mistral',
-                                        'qwen', 'deepseek', 'model', 'parameter']):
-        categories.append('models')
-
-    # Tools and products
-    if any(kw in text_lower for kw in ['tool', 'cli', 'api', 'code', 'app', 'plugin',
-                                        'extension', 'library', 'sdk']):
-        categories.append('tools')
-
-    # Concepts and terminology
-    if any(kw in text_lower for kw in ['concept', 'term', 'coined', 'definition',
-                                        'paradigm', 'pattern', 'methodology']):
-        categories.append('concepts')
-
-    # Pricing and business
-    if any(kw in text_lower for kw in ['$', 'price', 'cost', 'subscription',
-                                        'revenue', 'million', 'billion']):
-        categories.append('pricing')
-
-    # Companies
-    if any(kw in text_lower for kw in ['openai', 'anthropic', 'google', 'meta',
-                                        'microsoft', 'alibaba', 'amazon']):
-        categories.append('companies')
-
-    # Research
-    if any(kw in text_lower for kw in ['research', 'paper', 'study', 'benchmark',
-                                        'leaderboard', 'competition', 'olympiad']):
-        categories.append('research')
+def categorize_content(text_lower: str) -> list[str]:
+    """Attempt to categorize already-lowercased content based on keywords."""
+    words = set(_WORD_RE.findall(text_lower))
+    # Let plurals ("models", "tools") match their singular keyword
+    words.update([word[:-1] for word in words if word.endswith('s')])
+    categories = [cat for cat, keywords in CATEGORY_KEYWORDS.items()
+                  if not keywords.isdisjoint(words)]
 
     return categories if categories else ['concepts']
 
 
-def extract_dates(text: str, year: int) -> str | None:
-    """Try to extract date references from text."""
-    # Common patterns
-    month_pattern = r'(January|February|March|April|May|June|July|August|September|October|November|December)\s*(\d{1,2})?,?\s*(\d{4})?'
-    match = re.search(month_pattern, text, re.IGNORECASE)
+def extract_dates(text: str, year_str: str) -> str | None:
+    """Try to extract date references from text, defaulting to year_str."""
+    match = _MONTH_RE.search(text)
 
     if match:
         month = match.group(1)
         day = match.group(2)
-        found_year = match.group(3) or str(year)
+        found_year = match.group(3) or year_str
         if day:
             return f"{month} {day}, {found_year}"
         return f"{month} {found_year}"
 
-    return str(year)
+    return year_str
 
 
 def verify_link(url: str) -> dict:
-    """Verify if a link is accessible."""
+    """Verify if a link is accessible.
+
+    Uses a ranged GET rather than HEAD, which many hosts reject or treat
+    differently. Hosts that honour the Range header send at most one byte
+    of body; larger bodies from hosts that ignore it are never read.
+    """
     try:
-        response = requests.head(url, timeout=10, allow_redirects=True)
-        return {
-            'url': url,
-            'status': response.status_code,
-            'valid': response.status_code < 400,
-            'final_url': response.url if response.url != url else None
-        }
+        with SESSION.get(url, timeout=10, allow_redirects=True, stream=True,
+                         headers={'Range': 'bytes=0-0'}) as response:
+            # Closing a response with unread body makes urllib3 drop the
+            # socket, so drain small bodies to return it to the pool. Only a
+            # large body (Range ignored) is abandoned with its connection.
+            length = response.headers.get('Content-Length', '')
+            if response.status_code == 206 or (length.isdigit() and int(length) <= MAX_DRAIN_BYTES):
+                for _ in response.iter_content(MAX_DRAIN_BYTES):
+                    pass
+            return {
+                'url': url,
+                'status': response.status_code,
+                # 416 means the resource exists but is empty
+                'valid': response.status_code < 400 or response.status_code == 416,
+                'final_url': response.url if response.url != url else None
+            }
     except requests.RequestException as e:
         return {
             'url': url,
@@ -177,68 +320,94 @@ def verify_link(url: str) -> dict:
         }
 
 
-def scrape_year(year: int, verify_links: bool = False) -> dict | None:
-    """Scrape a single year's blog post."""
+def urls_to_verify(links: list[dict]) -> list[str]:
+    """Pick the unique link URLs to check for one year, up to the limit."""
+    unique_urls = list(set(link['url'] for link in links))
+    return unique_urls[:MAX_VERIFY_LINKS]
+
+
+def verify_links_concurrently(urls: list[str]) -> list[dict]:
+    """Verify links in parallel, returning results in input order."""
+    if not urls:
+        return []
+    with ThreadPoolExecutor(max_workers=min(len(urls), MAX_VERIFY_WORKERS)) as executor:
+        return list(executor.map(verify_link, urls))
+
+
+def scrape_year(year: int, cache_dir: Path | None = None) -> dict | None:
+    """Scrape a single year's blog post.
+
+    link_verification is left as None; main verifies all years' links in
+    one batch and fills it in.
+    """
     url = get_url_for_year(year)
-    print(f"Fetching {year} from {url}...")
+    year_str = str(year)
+    scraped_at = datetime.now().isoformat()
+    log(f"Fetching {year} from {url}...")
 
-    html = fetch_page(url)
+    html = fetch_page(url, cache_dir=cache_dir)
     if not html:
         return None
 
-    soup = BeautifulSoup(html, 'html.parser')
+    soup = BeautifulSoup(html, 'lxml')
 
     # Extract title
     title_elem = soup.find('h1') or soup.find('title')
     title = title_elem.get_text(strip=True) if title_elem else f"Year in LLMs {year}"
 
+    # Locate the post body once and share it between extractors
+    article = find_article(soup)
+
     # Extract all links
-    links = extract_links(soup, url)
+    links = extract_links(article, url)
 
     # Extract sections
-    sections = extract_headings_and_sections(soup)
+    sections = extract_headings_and_sections(article, url)
 
     # Build events from sections
     events = []
     for section in sections:
         if section['content']:
             content_text = ' '.join(section['content'])
+            content_lower = content_text.lower()
             event = {
                 'title': section['title'],
-                'date': extract_dates(content_text, year),
-                'categories': categorize_content(section['title'] + ' ' + content_text),
+                'date': extract_dates(content_text, year_str),
+                'categories': categorize_content(section['title'].lower() + ' ' + content_lower),
                 'description': content_text[:300] + '...' if len(content_text) > 300 else content_text,
-                'links': []
+                'links': section['links']
             }
-
-            # Find links that appear in this section's content
-            for link in links:
-                if link['text'].lower() in content_text.lower() or link['text'] in section['title']:
-                    event['links'].append(link)
-
             events.append(event)
 
-    # Verify links if requested
-    link_verification = []
-    if verify_links:
-        print(f"Verifying {len(links)} links...")
-        unique_urls = list(set(link['url'] for link in links))
-        for i, url in enumerate(unique_urls[:50]):  # Limit to first 50
-            print(f"  Checking [{i+1}/{min(len(unique_urls), 50)}]: {url[:60]}...")
-            link_verification.append(verify_link(url))
-
     return {
         'year': year,
         'source_url': url,
         'title': title,
-        'scraped_at': datetime.now().isoformat(),
+        'scraped_at': scraped_at,
         'events': events,
         'all_links': links,
         'sections': sections,
-        'link_verification': link_verification if verify_links else None
+        'link_verification': None
     }
 
 
+def _write_indented(f, payload: bytes) -> None:
+    """Write JSON bytes indented one extra level, without copying them.
+
+    orjson escapes newlines inside strings, so raw newlines are layout only.
+    """
+    view = memoryview(payload)
+    start = 0
+    while True:
+        end = payload.find(b'\n', start)
+        if end == -1:
+            f.write(view[start:])
+            return
+        f.write(view[start:end + 1])
+        f.write(b'  ')
+        start = end + 1
+
+
 def main():
     parser = argparse.ArgumentParser(
         description="Scrape Simon Willison's Year in LLMs blog posts"
@@ -264,6 +433,11 @@ def main():
         default='data',
         help='Output directory for JSON files (default: data)'
     )
+    parser.add_argument(
+        '--cache-dir',
+        type=Path,
+        help='Cache fetched pages here and revalidate them on later runs'
+    )
 
     args = parser.parse_args()
 
@@ -280,32 +454,84 @@ def main():
     output_dir = Path(args.output)
     output_dir.mkdir(exist_ok=True)
 
-    results = {}
-    for year in years:
-        data = scrape_year(year, verify_links=args.verify_links)
-        if data:
-            results[year] = data
-
-            # Save individual year file
-            output_file = output_dir / f"year_in_llms_{year}.json"
-            with open(output_file, 'w') as f:
-                json.dump(data, f, indent=2)
-            print(f"Saved {output_file}")
-
-    # Save combined file
-    if results:
-        combined_file = output_dir / "year_in_llms_all.json"
-        with open(combined_file, 'w') as f:
-            json.dump(results, f, indent=2)
-        print(f"Saved combined data to {combined_file}")
+    # Years are fetched and parsed in parallel threads (the GIL is released
+    # during network I/O), so every year's result is held in memory until
+    # all have finished; each is released as soon as it has been written.
+    with ThreadPoolExecutor(max_workers=min(len(years), MAX_YEAR_WORKERS)) as executor:
+        scraped = deque(
+            (year, data)
+            for year, data in zip(years, executor.map(
+                lambda year: scrape_year(year, cache_dir=args.cache_dir), years
+            ))
+            if data
+        )
+
+    # Verify links for all years in one batch, so a URL shared between
+    # years is only checked once, then attach results to each year
+    if args.verify_links and scraped:
+        urls_by_year = {year: urls_to_verify(data['all_links']) for year, data in scraped}
+        unique_urls = list(dict.fromkeys(
+            url for urls in urls_by_year.values() for url in urls
+        ))
+        log(f"Verifying {len(unique_urls)} unique links across {len(scraped)} year(s)...")
+        verified = dict(zip(unique_urls, verify_links_concurrently(unique_urls)))
+        for year, data in scraped:
+            data['link_verification'] = [verified[url] for url in urls_by_year[year]]
+
+    # Each year is serialized once; the same bytes go to the per-year file
+    # and are streamed into the combined file, which is written to a
+    # temporary file and moved into place only if at least one year succeeded.
+    combined_file = output_dir / "year_in_llms_all.json"
+    partial_file = combined_file.with_suffix('.json.partial')
+    summaries = {}
+    try:
+        with open(partial_file, 'wb') as combined:
+            combined.write(b'{')
+            while scraped:
+                year, data = scraped.popleft()
+
+                # Save individual year file
+                payload = orjson.dumps(data, option=orjson.OPT_INDENT_2)
+                output_file = output_dir / f"year_in_llms_{year}.json"
+                with open(output_file, 'wb') as f:
+                    f.write(payload)
+                log(f"Saved {output_file}")
+
+                # Append to the combined file, re-indented one level
+                combined.write(b',\n  ' if summaries else b'\n  ')
+                combined.write(f'"{year}": '.encode())
+                _write_indented(combined, payload)
+
+                # Keep only the counts needed for the summary
+                verification = data['link_verification']
+                summaries[year] = {
+                    'events': len(data['events']),
+                    'links': len(data['all_links']),
+                    'verified': (sum(1 for v in verification if v['valid']), len(verification))
+                    if verification else None
+                }
+                # Popped from the queue, so these were the last references:
+                # the year's sections, links and bytes are freed here
+                del data, payload
+            combined.write(b'\n}')
+    except BaseException:
+        # Don't leave a half-written combined file behind on any failure
+        partial_file.unlink(missing_ok=True)
+        raise
+
+    if summaries:
+        partial_file.replace(combined_file)
+        log(f"Saved combined data to {combined_file}")
+    else:
+        partial_file.unlink()
 
     # Print summary
     print("\n=== Summary ===")
-    for year, data in results.items():
-        print(f"{year}: {len(data['events'])} events, {len(data['all_links'])} links")
-        if data.get('link_verification'):
-            valid = sum(1 for v in data['link_verification'] if v['valid'])
-            print(f"  Links verified: {valid}/{len(data['link_verification'])} valid")
+    for year, summary in summaries.items():
+        print(f"{year}: {summary['events']} events, {summary['links']} links")
+        if summary['verified']:
+            valid, total = summary['verified']
+            print(f"  Links verified: {valid}/{total} valid")
 
 
 if __name__ == '__main__':